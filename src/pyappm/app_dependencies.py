@@ -36,6 +36,7 @@
 #
 
 import sys
+import shutil
 import subprocess
 
 from pathlib import Path
@@ -57,9 +58,9 @@ from pyapp_toml import LoadAppToml  # type: ignore
 from pyapp_toml import SaveAppToml
 
 
-def get_dep_pkg(toml: DotDict, dep: str) -> DotDict:
-    """Check if a dependency is installed."""
-    return next(pkg for pkg in toml["project"]["dependencies"] if pkg["name"] == dep)
+def index_deps(toml: DotDict) -> dict[str, DotDict]:
+    """Index the dependencies in the toml file by package name."""
+    return {pkg["name"]: pkg for pkg in toml["project"].get("dependencies", [])}
 
 
 def parse_dep(dep: str) -> tuple[str, str, str, bool]:
@@ -97,17 +98,23 @@ def parse_dep(dep: str) -> tuple[str, str, str, bool]:
     return pkg_name, pkg_version, pkg_extra, False
 
 
-def check_if_dep_installed(toml_path: Path, pkg_name: str) -> bool:
-    """Check if a dependency is installed."""
-    toml = LoadAppToml(toml_path)
+def check_if_dep_installed(
+    toml_path: Path, pkg_name: str, toml: DotDict | None = None
+) -> bool:
+    """Check if a dependency is installed, the toml is loaded when it is not given."""
+    if toml is None:
+        toml = LoadAppToml(toml_path)
     if "dependencies" not in toml["project"]:
         return False
     return any(pkg["name"] == pkg_name for pkg in toml["project"]["dependencies"])
 
 
-def add_dependency(toml_path: Path, dep: str, config: PyAPPMConfiguration) -> None:
+def add_dependency(
+    toml_path: Path, dep: str, config: PyAPPMConfiguration, toml: DotDict | None = None
+) -> None:
     """Add a dependency to the pyapp.toml file and install it in the virtual environment."""
-    toml = LoadAppToml(toml_path)
+    if toml is None:
+        toml = LoadAppToml(toml_path)
     if "dependencies" not in toml["project"]:
         toml["project"]["dependencies"] = []
     print("Installing dependency... (this may take a while)")
@@ -121,7 +128,7 @@ def add_dependency(toml_path: Path, dep: str, config: PyAPPMConfiguration) -> No
         dep_path = Path(dep).resolve()
         if dep_path.parent != deps_file_path:
             # only copy the file if it's not already in the deps directory
-            run_command(f"cp {dep_path} {deps_file_path}")
+            shutil.copy(dep_path, deps_file_path)
         dep_cmd = str(Path(deps_file_path, dep_path.name))
     cmd = make_dependancy_cmd(pkg_path, config, "install", dep_cmd)
     run_command(cmd)
@@ -135,8 +142,8 @@ def add_dependency(toml_path: Path, dep: str, config: PyAPPMConfiguration) -> No
         print(f"Failed to install {pkg_name}")
         print("Trying to roll back installation (this may take a while)")
         pkgs = get_list_diff(new_packages, packages, "@@@xxx@@@")
-        for pkg in pkgs:
-            run_command(make_dependancy_cmd(pkg_path, config, "uninstall -y", pkg))
+        if len(pkgs) > 0:
+            run_command(make_dependancy_cmd(pkg_path, config, "uninstall -y", pkgs))
         return
     new_deps = get_list_diff(packages, new_packages, pkg_name)
     pkg = DotDict(
@@ -153,25 +160,26 @@ def add_dependency(toml_path: Path, dep: str, config: PyAPPMConfiguration) -> No
     print(f"Installed {pkg_name}")
 
 
-def remove_dependency(toml_path: Path, dep: str, config: PyAPPMConfiguration) -> None:
+def remove_dependency(
+    toml_path: Path, dep: str, config: PyAPPMConfiguration, toml: DotDict | None = None
+) -> None:
     """Remove a dependency from the pyapp.toml file."""
-    toml = LoadAppToml(toml_path)
-    pkg = get_dep_pkg(toml, dep)
+    if toml is None:
+        toml = LoadAppToml(toml_path)
+    deps = index_deps(toml)
+    pkg = deps.pop(dep)
     print("Removing dependency... (this may take a while)")
     pkg_path = toml_path.parent
     rmv_pkg = pkg["name"]
     if pkg["extra"] != "":
         rmv_pkg = f"{pkg['name']}[{pkg['extra']}]"
-    run_command(make_dependancy_cmd(pkg_path, config, "uninstall -y", rmv_pkg))
+    rmv_pkgs = [rmv_pkg, *pkg["new_packages"]]
+    run_command(make_dependancy_cmd(pkg_path, config, "uninstall -y", rmv_pkgs))
 
-    for pkg in pkg["new_packages"]:
-        run_command(make_dependancy_cmd(pkg_path, config, "uninstall -y", pkg))
-
-    toml["project"]["dependencies"] = [
-        DotDict(pkg) for pkg in toml["project"]["dependencies"] if pkg["name"] != dep
-    ]
+    toml["project"]["dependencies"] = [DotDict(other) for other in deps.values()]
     SaveAppToml(toml_path, toml)
     if pkg["wheel"] is True:
         filename = f"{pkg['name']}*{WHEEL_EXT}"
-        run_command(f'rm {Path(pkg_path, "deps", filename)}')
+        for wheel in Path(pkg_path, "deps").glob(filename):
+            wheel.unlink()
     print(f"Removed {dep}")
@@ -40,6 +40,9 @@ class DotDict(dict):
     """A dictionary that supports dot notation access."""
 
     def __getattr__(self, item):
+        if item.startswith("__") and item.endswith("__"):
+            # Don't turn special method lookups (pickle, copy) into keys.
+            raise AttributeError(item)
         value = self.get(item)
         if isinstance(value, DotDict):
             return value
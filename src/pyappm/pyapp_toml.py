@@ -35,19 +35,26 @@
 
 from pathlib import Path
 
-from simple_toml import TomlReader, TomlWriter  # type: ignore
+from simple_toml import TomlWriter, loads  # type: ignore
 from dotdict import DotDict  # type: ignore
 
 from pyappm_configuration import PyAPPMConfiguration  # type: ignore
 
 
-def LoadAppToml(path: Path) -> DotDict:
+def LoadAppToml(path: Path | str) -> DotDict:
     """Load the toml file."""
-    if path is None or not path.exists():
+    if path is None:
         raise FileNotFoundError(f"File not found: {path}")
-    with TomlReader(path) as reader:
-        data = reader.read()
-    return data
+    try:
+        text = Path(path).read_bytes().decode("utf-8")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {path}") from None
+    return loads(text)
+
+
+def ParseAppToml(text: str) -> DotDict:
+    """Parse the text of a toml file."""
+    return loads(text)
 
 
 def SaveAppToml(path: Path, data: DotDict) -> None:
@@ -35,45 +35,18 @@
 
 import sys
 import os
+import re
+import stat
+import functools
+from typing import Callable
 from typing import Optional
 
-from dataclasses import dataclass
 from pathlib import Path
 
-
-from __about__ import __version__  # type: ignore
-
 from pyappm_constants import APP_TOML  # type: ignore
 
 from pyappm_configuration import PyAPPMConfiguration  # type: ignore
 
-from virtual_env import IsVirtualEnvActive  # type: ignore
-from virtual_env import DeleteVirtualEnv
-from virtual_env import CreateVirtualEnv
-from virtual_env import VirtualEnvInstallDependencies
-from virtual_env import VirtualEnvListDependencies
-
-from pyappm_tools import FindAppToml  # type: ignore
-from pyappm_tools import create_apps_list
-
-from pyapp_toml import LoadAppToml  # type: ignore
-from pyapp_toml import CreateAppToml
-from pyapp_toml import AppTomlListDependencies
-
-# Command implementations
-from pyappm_app_init import init_pyapp  # type: ignore
-from pyappm_app_init import check_if_initialized
-
-from app_dependencies import add_dependency  # type: ignore
-from app_dependencies import remove_dependency
-from app_dependencies import check_if_dep_installed
-
-from pyappm_app_builder import build_app
-
-from pyappm_app_installer import install_app  # type: ignore
-from pyappm_app_installer import uninstall_app
-from pyappm_app_installer import check_if_installed
-
 from pyappm_constants import EX_FAILED_TO_LOAD_CONFIG  # type: ignore
 from pyappm_constants import EX_INVALID_COMMAND
 from pyappm_constants import EX_NO_COMMAND_SPECIFIED
@@ -92,6 +65,8 @@ from pyappm_constants import EX_IS_ALREADY_INSTALLED
 from pyappm_constants import EX_IS_NOT_INSTALLED
 from pyappm_constants import EX_INVALID_DEPENDENCY
 from pyappm_constants import EX_INVALID_SERVICE_OPTION
+from pyappm_constants import EX_INVALID_NO_CACHE_OPTION
+from pyappm_constants import EX_INVALID_FORCE_OPTION
 
 from pyappm_constants import MSG_NOAPPSINSTALLED
 from pyappm_constants import MSG_INSTALLEDAPPS
@@ -106,122 +81,194 @@ from pyappm_constants import MSG_VERSION
 
 from pyappm_constants import WHEEL_EXT
 
-from pyappm_repository import PyAPPMRepositoryManager  # type: ignore
+# Every command alias mapped to the canonical command name.
+CMD_ALIASES: dict[str, str] = {
+    "help": "help",
+    "--help": "help",
+    "-h": "help",
+    "-?": "help",
+    "version": "version",
+    "--version": "version",
+    "-v": "version",
+    "init": "init",
+    "--init": "init",
+    "add": "add",
+    "--add": "add",
+    "-a": "add",
+    "remove": "remove",
+    "--remove": "remove",
+    "-r": "remove",
+    "find": "find",
+    "--find": "find",
+    "-f": "find",
+    "install": "install",
+    "--install": "install",
+    "-i": "install",
+    "uninstall": "uninstall",
+    "--uninstall": "uninstall",
+    "-u": "uninstall",
+    "build": "build",
+    "--build": "build",
+    "-b": "build",
+    "list": "list",
+    "--list": "list",
+    "-l": "list",
+    "deps": "deps",
+    "--deps": "deps",
+    "-d": "deps",
+    "venv": "venv",
+    "--venv": "venv",
+    "toml": "toml",
+    "--toml": "toml",
+}
+
+SERVICE_ARG = "--service"
+SERVICE_COMMANDS = frozenset({"init", "toml"})
+NO_CACHE_ARG = "--no-cache"
+NO_CACHE_COMMANDS = frozenset({"find"})
+FORCE_ARG = "--force"
+FORCE_COMMANDS = frozenset({"build"})
+OPTION_ARGS = frozenset({SERVICE_ARG, NO_CACHE_ARG, FORCE_ARG})
+
+VALID_ARGS = frozenset(CMD_ALIASES)
+
+# Commands that require an argument, with the message shown when it is missing.
+ARG_COMMANDS: dict[str, str] = {
+    "add": EX_NO_DEP_SPECIFIED,
+    "remove": EX_NO_DEP_SPECIFIED,
+    "install": EX_NO_APP_SPECIFIED,
+    "uninstall": EX_NO_APP_SPECIFIED,
+    "find": EX_NO_APP_SPECIFIED,
+}
+
+# Commands without an argument, mapped to the PaAppArgs flag they set.
+FLAG_COMMANDS: dict[str, str] = {
+    "build": "build",
+    "list": "list",
+    "deps": "list_deps",
+}
+
+VENV_COMMANDS: dict[str, str] = {
+    "create": "venv_create",
+    "delete": "venv_delete",
+    "requirements": "venv_requirements",
+    "reqs": "venv_requirements",
+    "r": "venv_requirements",
+    "list": "venv_list",
+}
+
+TOML_COMMANDS: dict[str, str] = {
+    "create": "toml_create",
+    "list": "toml_list",
+}
+
+HELP_TEXT = (
+    "\n"
+    "Python Application Manager (pyappm) is a tool to manage Python applications and their dependencies.\n"
+    "\n"
+    "Usage: pyappm [command] [arguments] [options]\n"
+    "\n"
+    "  pyappm init [application name] [--service]     Initialize the application\n"
+    "\n"
+    "  pyappm build [--force]                         Build the application\n"
+    "\n"
+    "  pyappm add [dependency]                        Add a dependency\n"
+    "  pyappm remove [dependency]                     Remove a dependency\n"
+    "\n"
+    "  pyappm install [application]                   Install an application\n"
+    "  pyappm uninstall [application]                 Uninstall an application\n"
+    "  pyappm find [application]                      Find the application\n"
+    "  pyappm find all [--no-cache]                   List all applications\n"
+    "\n"
+    "  pyappm list                                    List the installed applications.\n"
+    "\n"
+    "  pyappm version                                 Show the version number\n"
+    "  pyappm help                                    Show this message\n"
+    "\n"
+    "  pyappm venv create                             Create a virtual environment\n"
+    "  pyappm venv delete                             Delete the virtual environment\n"
+    "  pyappm venv list                               Lists installed dependencies\n"
+    "  pyappm venv requirements                       Installs the dependencies\n"
+    "\n"
+    "  pyappm toml create [--service]                 Create a default pyapp.toml\n"
+    "  pyappm toml list                               List the dependencies in pyapp.toml\n"
+    "\n"
+    "For more information, see the README.md file.\n"
+)
+
+# name [operand version], the operand and version are optional.
+APP_SPEC_RE = re.compile(r"\s*(.*?)\s*(?:(==|>=|<=|!=)\s*(.*?))?\s*", re.DOTALL)
+
+# A version is either "latest" or a dotted number with an optional a, b, rc or dev tag.
+VERSION_RE = re.compile(r"latest|\d+(?:\.\d+)*(?:\.?(?:a|b|rc|dev)\d*)?")
 
 
 def help() -> None:
     """Print the help message."""
-    print()
-    print(
-        "Python Application Manager (pyappm) is a tool to manage Python applications and their dependencies."
-    )
-    print()
-    print("Usage: pyappm [command] [arguments] [options]")
-    print()
-    print("  pyappm init [application name] [--service]     Initialize the application")
-    print()
-    print("  pyappm build                                   Build the application")
-    print()
-    print("  pyappm add [dependency]                        Add a dependency")
-    print("  pyappm remove [dependency]                     Remove a dependency")
-    print()
-    print("  pyappm install [application]                   Install an application")
-    print("  pyappm uninstall [application]                 Uninstall an application")
-    print("  pyappm find [application]                      Find the application")
-    print()
-    print(
-        "  pyappm list                                    List the installed applications."
-    )
-    print()
-    print("  pyappm version                                 Show the version number")
-    print("  pyappm help                                    Show this message")
+    sys.stdout.write(HELP_TEXT)
+
+
+def print_version() -> None:
+    """Print the version number."""
+    from __about__ import __version__  # type: ignore
 
     print()
-    print(
-        "  pyappm venv create                             Create a virtual environment"
-    )
-    print(
-        "  pyappm venv delete                             Delete the virtual environment"
-    )
-    print(
-        "  pyappm venv list                               Lists installed dependencies"
-    )
-    print("  pyappm venv requirements                       Installs the dependencies")
-    print()
-    print(
-        "  pyappm toml create [--service]                 Create a default pyapp.toml"
-    )
-    print(
-        "  pyappm toml list                               List the dependencies in pyapp.toml"
-    )
+    print(f"Python Application Manager {MSG_VERSION} {__version__}")
     print()
-    print("For more information, see the README.md file.")
 
 
-@dataclass
 class PaAppArgs:
-    init: Optional[str]
-    add: Optional[str]
-    add_local: Optional[str]
-    remove: Optional[str]
-    remove_local: Optional[str]
-    install: Optional[str]
-    uninstall: Optional[str]
-    find: Optional[str]
-    init_as_service: bool = False
-    build: bool = False
-    list: bool = False
-    list_deps: bool = False
-    venv_create: bool = False
-    venv_delete: bool = False
-    venv_requirements: bool = False
-    venv_list: bool = False
-    toml_list: bool = False
-    toml_create: bool = False
-
-
-def validate_args() -> None:
-    """Validate the command line arguments."""
-    if sys.argv[1] not in [
-        "help",
-        "--help",
-        "-h",
-        "-?",
-        "version",
-        "--version",
-        "-v",
+    __slots__ = (
+        "command",
         "init",
-        "--init",
-        "--service",
         "add",
-        "--add",
-        "-a",
+        "add_local",
         "remove",
-        "--remove",
-        "-r",
-        "find",
-        "--find",
-        "-f",
+        "remove_local",
         "install",
-        "--install",
-        "-i",
         "uninstall",
-        "--uninstall",
-        "-u",
+        "find",
+        "init_as_service",
+        "no_cache",
+        "force",
         "build",
-        "--build",
-        "-b",
         "list",
-        "--list",
-        "-l",
-        "deps",
-        "--deps",
-        "-d",
-        "venv",
-        "--venv",
-        "toml",
-        "--toml",
-    ]:
+        "list_deps",
+        "venv_create",
+        "venv_delete",
+        "venv_requirements",
+        "venv_list",
+        "toml_list",
+        "toml_create",
+    )
+
+    def __init__(self) -> None:
+        self.command: str = ""
+        self.init: Optional[str] = None
+        self.add: Optional[str] = None
+        self.add_local: Optional[str] = None
+        self.remove: Optional[str] = None
+        self.remove_local: Optional[str] = None
+        self.install: Optional[str] = None
+        self.uninstall: Optional[str] = None
+        self.find: Optional[str] = None
+        self.init_as_service: bool = False
+        self.no_cache: bool = False
+        self.force: bool = False
+        self.build: bool = False
+        self.list: bool = False
+        self.list_deps: bool = False
+        self.venv_create: bool = False
+        self.venv_delete: bool = False
+        self.venv_requirements: bool = False
+        self.venv_list: bool = False
+        self.toml_list: bool = False
+        self.toml_create: bool = False
+
+
+def validate_args() -> None:
+    """Validate the command line arguments."""
+    if sys.argv[1] not in VALID_ARGS:
         print(f"{EX_INVALID_COMMAND} {sys.argv[1]}")
         help()
         sys.exit(1)
@@ -240,343 +287,333 @@ def parse_args() -> PaAppArgs:
         print(EX_NO_COMMAND_SPECIFIED)
         help()
         sys.exit(1)
-    if len(sys.argv) > 4:
+    # Help and version exit before the rest of the arguments are validated.
+    if fast_help_version():
+        sys.exit(0)
+    validate_args()
+    cmd = CMD_ALIASES[sys.argv[1]]
+    # Split off the options, so they're never taken as the argument.
+    params = [param for param in sys.argv[2:] if param not in OPTION_ARGS]
+    is_service = SERVICE_ARG in sys.argv[2:]
+    no_cache = NO_CACHE_ARG in sys.argv[2:]
+    force = FORCE_ARG in sys.argv[2:]
+    if len(params) > (0 if cmd in FLAG_COMMANDS else 1):
         print(EX_INVALID_NUMBER_OF_ARGUMENTS)
         help()
         sys.exit(1)
-    validate_args()
-    res = PaAppArgs(
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        False,
-        False,
-        False,
-        False,
-        False,
-        False,
-        False,
-        False,
-        False,
-        False,
-    )
-    cmd = sys.argv[1]
-    arg = None
-    if len(sys.argv) >= 3:
-        arg = sys.argv[2]
-    if cmd in ["version", "--version", "-v"]:
-        print()
-        print(f"Python Application Manager {MSG_VERSION} {__version__}")
-        print()
-        sys.exit(0)
-    if (cmd in ["help", "--help", "-h", "-?"]) or (len(sys.argv) == 1):
-        help()
-        sys.exit(0)
-    if "--service" in sys.argv and cmd not in ["init", "--init", "toml", "--toml"]:
-        print(EX_INVALID_SERVICE_OPTION)
-        sys.exit(1)
-    if cmd in ["init", "--init"]:
+    arg = params[0] if len(params) > 0 else None
+    if is_service and cmd not in SERVICE_COMMANDS:
+        sys.exit(EX_INVALID_SERVICE_OPTION)
+    # Only the full application list is cached, so --no-cache only applies to find all.
+    if no_cache and (cmd not in NO_CACHE_COMMANDS or arg != "all"):
+        sys.exit(EX_INVALID_NO_CACHE_OPTION)
+    if force and cmd not in FORCE_COMMANDS:
+        sys.exit(EX_INVALID_FORCE_OPTION)
+    res = PaAppArgs()
+    res.command = cmd
+    res.no_cache = no_cache
+    res.force = force
+    if cmd == "init":
         res.init = arg_or_default(arg, ".")
-        if "--service" in sys.argv:
-            res.init_as_service = True
-    if cmd in ["add", "--add", "-a"]:
-        if arg is None:  # pragma: no cover
-            print(EX_NO_DEP_SPECIFIED)
-            sys.exit(1)
-        res.add = arg
-    if cmd in ["remove", "--remove", "-r"]:
-        if arg is None:
-            print(EX_NO_DEP_SPECIFIED)
-            sys.exit(1)
-        res.remove = arg
-    if cmd in ["install", "--install", "-i"]:
-        if arg is None:
-            print(EX_NO_APP_SPECIFIED)
-            sys.exit(1)
-        res.install = arg
-    if cmd in ["uninstall", "--uninstall", "-u"]:
+        res.init_as_service = is_service
+    elif cmd in ARG_COMMANDS:
         if arg is None:
-            print(EX_NO_APP_SPECIFIED)
-            sys.exit(1)
-        res.uninstall = arg
-    if cmd in ["find", "--find", "-f"]:
-        if arg is None:
-            print(EX_NO_APP_SPECIFIED)
-            sys.exit(1)
-        res.find = arg
-    if cmd in ["build", "--build", "-b"]:
-        res.build = True
-    if cmd in ["list", "--list", "-l"]:
-        res.list = True
-    if cmd in ["deps", "--deps", "-d"]:
-        res.list_deps = True
-    if cmd in ["venv", "--venv"]:
-        if arg == "create":
-            res.venv_create = True
-        elif arg == "delete":
-            res.venv_delete = True
-        elif arg in ["requirements", "reqs", "r"]:
-            res.venv_requirements = True
-        elif arg == "list":
-            res.venv_list = True
-        else:
-            print(f"{EX_INVALID_VENV_COMMAND} {arg}.")
-            sys.exit(1)
-    if cmd in ["toml", "--toml"]:
-        if arg == "create":
-            res.toml_create = True
-        elif arg == "list":
-            res.toml_list = True
-        else:
-            print(f"{EX_INVALID_TOML_COMMAND} {arg}.")
-            sys.exit(1)
-        if "--service" in sys.argv:
-            res.init_as_service = True
+            sys.exit(ARG_COMMANDS[cmd])
+        setattr(res, cmd, arg)
+    elif cmd in FLAG_COMMANDS:
+        setattr(res, FLAG_COMMANDS[cmd], True)
+    elif cmd == "venv":
+        if arg not in VENV_COMMANDS:
+            sys.exit(f"{EX_INVALID_VENV_COMMAND} {arg}.")
+        setattr(res, VENV_COMMANDS[arg], True)
+    elif cmd == "toml":
+        if arg not in TOML_COMMANDS:
+            sys.exit(f"{EX_INVALID_TOML_COMMAND} {arg}.")
+        setattr(res, TOML_COMMANDS[arg], True)
+        res.init_as_service = is_service
     return res
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> PyAPPMConfiguration:
-    """Create the configuration object and execute its load function."""
+    """Create the configuration object and execute its load function.
+    It is loaded once per process, load_config.cache_clear() loads it again.
+    """
     config = PyAPPMConfiguration().load()
     if config is None:
-        print(EX_FAILED_TO_LOAD_CONFIG)
-        sys.exit(1)
+        sys.exit(EX_FAILED_TO_LOAD_CONFIG)
     return config
 
 
 def validate_version(version: str) -> str:
     """Velidate the version string for use as a url parameter."""
-    v: list = []
-    l = len(version)
-    i = 0
-    while i < l:
-        if version[i].isdigit():
-            start = i
-            while i < l and version[i].isdigit():
-                i += 1
-            v.append(version[start:i])
-        if version[i] == ".":
-            v.append(".")
-        if version[i].isalpha():
-            start = i
-            while i < l and version[i].isalpha():
-                i += 1
-            v.append(version[start:i])
-        else:
-            print(f"{EX_INVALID_VERSION_STRING} {version}")
-            sys.exit(1)
-        i += 1
-    for part in v:
-        if part.isalpha():
-            if (
-                part != "a"
-                and part != "b"
-                and part != "rc"
-                and part != "dev"
-                and part != "latest"
-            ):
-                print(f"{EX_INVALID_VERSION_STRING} {version}")
-                sys.exit(1)
-        elif part == ".":
-            continue
-        elif not part.isdigit():
-            print(f"{EX_INVALID_VERSION_STRING} {version}")
-            sys.exit(1)
-
+    if VERSION_RE.fullmatch(version) is None:
+        sys.exit(f"{EX_INVALID_VERSION_STRING} {version}")
     return version
 
 
 def list_installed_apps(config: PyAPPMConfiguration) -> None:
     """List the installed applications."""
-    apps = create_apps_list()
-    if len(apps) == 0:
+    from pyappm_tools import iter_apps  # type: ignore
+    from pyapp_toml import LoadAppToml  # type: ignore
+
+    paths = [config.app_dir / app / APP_TOML for app in iter_apps(config.app_dir)]
+    if len(paths) == 0:
         print(MSG_NOAPPSINSTALLED)
         return
     print(MSG_INSTALLEDAPPS)
-    for app in apps:
-        app_path = config.app_dir / app
-        app_toml_path = app_path / APP_TOML
-        app_toml = LoadAppToml(app_toml_path)
+    for path in paths:
+        app_toml = LoadAppToml(path)
         print(f"  {app_toml['project']['name']} v{app_toml['project']['version']}")
 
 
-def validate_local(dep: str) -> bool:
+def validate_local(dep: str | os.PathLike) -> bool:
     """Validate the local dependency file."""
-    dep_path = Path(dep)
-    if not Path(dep).exists():
-        return False
-    if not dep_path.is_file():
+    dep = os.fspath(dep)
+    # Check the name first, only a wheel file needs the stat call.
+    if not dep.endswith(WHEEL_EXT):
         return False
-    if dep_path.suffix != WHEEL_EXT:
+    try:
+        return stat.S_ISREG(os.stat(dep).st_mode)
+    except OSError:
         return False
-    return True
 
 
 def get_app_details(app: str) -> tuple[str, str, str]:
     """Get the application details."""
-    name = app
-    operand = None
-    version = None
-
-    if "==" in app:
-        name, version = app.split("==")
-        operand = "=="
-    elif ">=" in app:
-        name, version = app.split(">=")
-        operand = ">="
-    elif "<=" in app:
-        name, version = app.split("<=")
-        operand = "<="
-    elif "!=" in app:
-        name, version = app.split("!=")
-        operand = "!="
-
-    if version is not None:
-        version = version.strip()
-
+    name, operand, version = APP_SPEC_RE.fullmatch(app).groups()  # type: ignore
     if operand is None:
-        operand = "*"
-    if version is None:
-        version = "latest"
-
-    return name.strip(), operand, version
+        return name, "*", "latest"
+    return name, operand, version
 
 
 def ver_to_str(ver) -> str:
     """Convert the version to a string."""
-    if ver == "*":
-        return ver
-    if ver == "latest":
+    # "*", "latest" or an already formatted version are returned as they are.
+    if isinstance(ver, str):
         return ver
-    return ".".join(map(str, ver))
+    return ".".join([str(part) for part in ver])
 
 
-def main() -> None:
-    config: PyAPPMConfiguration = load_config()
-    repo: PyAPPMRepositoryManager = PyAPPMRepositoryManager()
-    args: PaAppArgs = parse_args()
-    if args.init is not None:
-        if check_if_initialized(args.init, config):
-            print(EX_APP_ALREADY_INITIALIZED)
-            sys.exit(1)
-        return init_pyapp(args.init, args.init_as_service, config)
-
-    if args.install is not None:
-        if IsVirtualEnvActive():
-            print(EX_DEACTIVATE_VENV)
-            sys.exit(1)
-        name, op, version = get_app_details(args.install)
-        version = validate_version(version)
-        if check_if_installed(name):
-            print(f"{name} {EX_APP_ALREADY_INSTALLED}")
-            sys.exit(1)
-        return install_app(name=name, op=op, version=version, config=config, repo=repo)
-
-    if args.find is not None:
-        print("Searching for", args.find)
-        name, op, version = get_app_details(args.find)
-
-        if name == "all":
-            print("Listing all apps..")
-            apps = repo.list_apps()
+def require_app_toml() -> Path:
+    """Find the pyapp.toml of the application, or exit when there is none."""
+    from pyappm_tools import FindAppToml  # type: ignore
+
+    toml_path = FindAppToml()
+    if toml_path is None:
+        sys.exit(f"{MSG_TOML_NOT_FOUND}\n{MSG_CREATE_TOML}")
+    return toml_path
+
+
+def require_virtual_env() -> None:
+    """Exit when the virtual environment of the application is not active."""
+    from virtual_env import IsVirtualEnvActive  # type: ignore
+
+    if not IsVirtualEnvActive():
+        sys.exit(f"{MSG_VENV_NOT_ACTIVE}\n{MSG_ACTIVATE_VENV}")
+
+
+def cmd_init(args: PaAppArgs) -> None:
+    """Initialize a new application."""
+    from pyappm_app_init import init_pyapp  # type: ignore
+    from pyappm_app_init import check_if_initialized
+
+    config = load_config()
+    if check_if_initialized(args.init, config):
+        sys.exit(EX_APP_ALREADY_INITIALIZED)
+    init_pyapp(args.init, args.init_as_service, config)
+
+
+def cmd_install(args: PaAppArgs) -> None:
+    """Install an application from the repository."""
+    from pyappm_app_installer import install_app  # type: ignore
+    from pyappm_app_installer import check_if_installed
+    from pyappm_repository import PyAPPMRepositoryManager  # type: ignore
+    from virtual_env import IsVirtualEnvActive  # type: ignore
+
+    name, op, version = get_app_details(args.install)
+    version = validate_version(version)
+    if check_if_installed(name):
+        sys.exit(f"{name} {EX_APP_ALREADY_INSTALLED}")
+    if IsVirtualEnvActive():
+        sys.exit(EX_DEACTIVATE_VENV)
+    config = load_config()
+    repo = PyAPPMRepositoryManager()
+    install_app(name=name, op=op, version=version, config=config, repo=repo)
+
+
+def cmd_find(args: PaAppArgs) -> None:
+    """Find an application in the repository."""
+    from pyappm_repository import PyAPPMRepositoryManager  # type: ignore
+
+    print("Searching for", args.find)
+    name, op, version = get_app_details(args.find)
+    repo = PyAPPMRepositoryManager(use_cache=not args.no_cache)
+
+    if name == "all":
+        print("Listing all apps..")
+        apps = repo.list_apps()
+    else:
+        apps = repo.find_app(name, op=op, version=version)
+    if len(apps) == 0:
+        sys.exit(f"{name} {EX_APP_NOT_FOUND}")
+
+    for a in apps:
+        if "repo" in a:
+            # {'repo': {'app': {'id': 1, 'owner_id': 1, 'name': 'pyappm', 'type': 'application', 'version': [0, 1], 'description': 'Python application manager client', 'created_at': '2024-07-29T00:00:00', 'updated_at': '2024-07-29T00:00:00'}}}
+            name = a["repo"]["app"]["name"]  # type: ignore
+            ver = ver_to_str(a["repo"]["app"]["version"])  # type: ignore
+            app_type = a["repo"]["app"]["type"]  # type: ignore
+            desc = a["repo"]["app"]["description"]
         else:
-            apps = repo.find_app(name, op=op, version=version)
-        if len(apps) == 0:
-            print(f"{name} {EX_APP_NOT_FOUND}")
-            sys.exit(1)
-
-        for a in apps:
-            if "repo" in a:
-                # {'repo': {'app': {'id': 1, 'owner_id': 1, 'name': 'pyappm', 'type': 'application', 'version': [0, 1], 'description': 'Python application manager client', 'created_at': '2024-07-29T00:00:00', 'updated_at': '2024-07-29T00:00:00'}}}
-                name = a["repo"]["app"]["name"]  # type: ignore
-                ver = ver_to_str(a["repo"]["app"]["version"])  # type: ignore
-                app_type = a["repo"]["app"]["type"]  # type: ignore
-                desc = a["repo"]["app"]["description"]
-            else:
-                # {'id': 1, 'owner_id': 1, 'name': 'pyappm', 'type': 'application', 'version': [0, 1], 'description': 'Python application manager client', 'created_at': '2024-07-29T00:00:00', 'updated_at': '2024-07-29T00:00:00'}
-                ver = ""
-                for i in a.get("version", ["*"]):
-                    ver += (str(i) if isinstance(i, int) else i) + "."
-                name = a["name"]
-                app_type = a["type"]
-                desc = a["description"]
-            print(f"{name} version: {ver} type: {app_type} description: {desc}")
-        return
+            # {'id': 1, 'owner_id': 1, 'name': 'pyappm', 'type': 'application', 'version': [0, 1], 'description': 'Python application manager client', 'created_at': '2024-07-29T00:00:00', 'updated_at': '2024-07-29T00:00:00'}
+            ver = ver_to_str(a.get("version", ["*"]))
+            name = a["name"]
+            app_type = a["type"]
+            desc = a["description"]
+        print(f"{name} version: {ver} type: {app_type} description: {desc}")
 
-    if args.uninstall is not None:
-        if not check_if_installed(args.uninstall):
-            print(f"{args.uninstall} {EX_APP_NOT_INSTALLED}")
-            sys.exit(1)
-        return uninstall_app(args.uninstall, config)
 
-    toml_path = FindAppToml()
-    venv_root_path = Path(os.getcwd()) if toml_path is None else toml_path.parent
+def cmd_uninstall(args: PaAppArgs) -> None:
+    """Uninstall an installed application."""
+    from pyappm_app_installer import uninstall_app  # type: ignore
+    from pyappm_app_installer import check_if_installed
+
+    if not check_if_installed(args.uninstall):
+        sys.exit(f"{args.uninstall} {EX_APP_NOT_INSTALLED}")
+    uninstall_app(args.uninstall, load_config())
+
+
+def cmd_list(args: PaAppArgs) -> None:
+    """List the installed applications."""
+    list_installed_apps(load_config())
 
-    if args.list is True:
-        return list_installed_apps(config)
+
+def cmd_toml(args: PaAppArgs) -> None:
+    """Create the pyapp.toml file or list its dependencies."""
+    from pyapp_toml import CreateAppToml  # type: ignore
+    from pyapp_toml import AppTomlListDependencies
 
     if args.toml_create is True:
-        toml_path = Path(os.getcwd()) / APP_TOML
-        app_name = Path(os.getcwd()).name
-        CreateAppToml(toml_path, app_name, config, args.init_as_service)
+        cwd = Path(os.getcwd())
+        toml_path = cwd / APP_TOML
+        app_name = cwd.name
+        CreateAppToml(toml_path, app_name, load_config(), args.init_as_service)
         print(f"{MSG_CREATED} {APP_TOML}")
         return
+    AppTomlListDependencies(require_app_toml())
 
-    if args.venv_delete is True:
-        DeleteVirtualEnv(venv_root_path, config)
-        print(MSG_DELETED_VENV)
-        return
 
-    if args.venv_create is True:
-        CreateVirtualEnv(venv_root_path, config)
-        print(MSG_CREATED_VENV)
-        return
+def cmd_deps(args: PaAppArgs) -> None:
+    """List the dependencies of the application."""
+    from pyapp_toml import AppTomlListDependencies  # type: ignore
 
-    if args.venv_requirements is True:
-        return VirtualEnvInstallDependencies(venv_root_path, config)
+    AppTomlListDependencies(require_app_toml())
 
-    if args.venv_list is True:
-        return VirtualEnvListDependencies(venv_root_path, config)
 
-    if args.toml_list is True:
-        if toml_path is None:
-            print(MSG_TOML_NOT_FOUND)
-            print(MSG_CREATE_TOML)
-            sys.exit(1)
-        return AppTomlListDependencies(toml_path)
+def cmd_venv(args: PaAppArgs) -> None:
+    """Manage the virtual environment of the application."""
+    from pyappm_tools import FindAppToml  # type: ignore
+    from virtual_env import DeleteVirtualEnv  # type: ignore
+    from virtual_env import CreateVirtualEnv
+    from virtual_env import VirtualEnvInstallDependencies
+    from virtual_env import VirtualEnvListDependencies
 
-    if not IsVirtualEnvActive():
-        print(MSG_VENV_NOT_ACTIVE)
-        print(MSG_ACTIVATE_VENV)
-        sys.exit(1)
+    toml_path = FindAppToml()
+    venv_root_path = Path(os.getcwd()) if toml_path is None else toml_path.parent
+    config = load_config()
+
+    if args.venv_delete is True:
+        DeleteVirtualEnv(venv_root_path, config)
+        print(MSG_DELETED_VENV)
+    elif args.venv_create is True:
+        CreateVirtualEnv(venv_root_path, config)
+        print(MSG_CREATED_VENV)
+    elif args.venv_requirements is True:
+        VirtualEnvInstallDependencies(venv_root_path, config)
+    elif args.venv_list is True:
+        VirtualEnvListDependencies(venv_root_path, config)
+
+
+def cmd_build(args: PaAppArgs) -> None:
+    """Build the application."""
+    from pyappm_app_builder import build_app  # type: ignore
+
+    build_app(require_app_toml(), load_config(), force=args.force)
+
+
+def cmd_add(args: PaAppArgs) -> None:
+    """Add a dependency to the application."""
+    from app_dependencies import add_dependency  # type: ignore
+    from app_dependencies import check_if_dep_installed
+    from pyapp_toml import LoadAppToml  # type: ignore
+
+    toml_path = require_app_toml()
+    # Only the commands that change the dependencies need an active virtual environment.
+    require_virtual_env()
+    # A plain package name like "requests" can't be a local file, it never needs a stat.
+    looks_local = "." in args.add or os.sep in args.add
+    if looks_local and os.path.isfile(args.add) and not validate_local(args.add):
+        sys.exit(f"{EX_INVALID_DEPENDENCY} {args.add}")
+    # Load the toml once, for both the check and the change.
+    toml = LoadAppToml(toml_path)
+    if check_if_dep_installed(toml_path, args.add, toml):
+        sys.exit(f"{args.add} {EX_IS_ALREADY_INSTALLED}")
+    add_dependency(toml_path, args.add, load_config(), toml)
+
+
+def cmd_remove(args: PaAppArgs) -> None:
+    """Remove a dependency from the application."""
+    from app_dependencies import remove_dependency  # type: ignore
+    from app_dependencies import check_if_dep_installed
+    from pyapp_toml import LoadAppToml  # type: ignore
+
+    toml_path = require_app_toml()
+    require_virtual_env()
+    toml = LoadAppToml(toml_path)
+    if not check_if_dep_installed(toml_path, args.remove, toml):
+        sys.exit(f"{args.remove} {EX_IS_NOT_INSTALLED}")
+    remove_dependency(toml_path, args.remove, load_config(), toml)
+
+
+# The handler of every canonical command, help and version are answered before dispatch.
+COMMAND_HANDLERS: dict[str, Callable[[PaAppArgs], None]] = {
+    "init": cmd_init,
+    "install": cmd_install,
+    "find": cmd_find,
+    "uninstall": cmd_uninstall,
+    "list": cmd_list,
+    "toml": cmd_toml,
+    "deps": cmd_deps,
+    "venv": cmd_venv,
+    "build": cmd_build,
+    "add": cmd_add,
+    "remove": cmd_remove,
+}
+
+
+def fast_help_version() -> bool:
+    """Answer help and version before anything else is loaded.
+    Returns True when the command was answered.
+    """
+    if len(sys.argv) < 2:
+        return False
+    cmd = CMD_ALIASES.get(sys.argv[1])
+    if cmd == "version":
+        print_version()
+        return True
+    if cmd == "help":
+        help()
+        return True
+    return False
 
-    if toml_path is None:
-        print(MSG_TOML_NOT_FOUND)
-        print(MSG_CREATE_TOML)
-        sys.exit(1)
 
-    if args.build is True:
-        return build_app(toml_path, config)
-
-    if args.add is not None:
-        if Path(args.add).is_file() and not validate_local(args.add):
-            print(f"{EX_INVALID_DEPENDENCY} {args.add}")
-            sys.exit(1)
-        if check_if_dep_installed(toml_path, args.add):
-            print(f"{args.add} {EX_IS_ALREADY_INSTALLED}")
-            sys.exit(1)
-        return add_dependency(toml_path, args.add, config)
-
-    if args.remove is not None:
-        if not check_if_dep_installed(toml_path, args.remove):
-            print(f"{args.remove} {EX_IS_NOT_INSTALLED}")
-            sys.exit(1)
-        return remove_dependency(toml_path, args.remove, config)
+def main() -> None:
+    # Help and version don't need the configuration or any command module.
+    if fast_help_version():
+        return
+    args: PaAppArgs = parse_args()
+    COMMAND_HANDLERS[args.command](args)
 
 
 if __name__ == "__main__":
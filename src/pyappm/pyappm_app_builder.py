@@ -35,7 +35,7 @@
 #
 # usage: pyappm build
 #
-# For this the virtual environment of the application needs to be active.
+# The build command does not need the application's virtual environment to be active.
 # The build command creates a zip archive of the application source code and local dependencies using the pyapp.toml file.
 # The zip archive is created in the build directory of the application and then moved to <app_name>-<version>.pap in the dist directory once finished.
 #
@@ -64,64 +64,123 @@
 # files = ["py.typed", ...]
 # directories = [...]
 
+import os
 import sys
+import json
+import shutil
+import zipfile
 from pathlib import Path
 
 from pyappm_constants import PYAPP_EXT  # type: ignore
+from pyappm_constants import BUILD_CACHE_FILE
 
 from pyappm_configuration import PyAPPMConfiguration  # type: ignore
 
-from pyappm_tools import run_command  # type: ignore
 from pyapp_toml import LoadAppToml  # type: ignore
 
+# Files from the source directory that are always included in the archive.
+SOURCE_SUFFIXES = (".py",)
+SOURCE_FILES = frozenset({"py.typed"})
 
-def build_app(toml_path: Path, config: PyAPPMConfiguration) -> None:
-    """Build the application."""
+# Files from the application directory that are always included in the archive.
+APP_FILES = ("pyapp.toml", "LICENSE.txt", "README.md")
+
+
+class ArchiveContents:
+    """The files of the application archive, each member only once."""
+
+    def __init__(self) -> None:
+        # Archive member name mapped to the file it is read from, in the order added.
+        self.files: dict[str, str] = {}
+
+    def add(self, path: str, arcname: str) -> None:
+        """Add a file, or a directory and everything below it, to the archive."""
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                for filename in filenames:
+                    full_path = os.path.join(root, filename)
+                    self.add_file(
+                        full_path,
+                        os.path.join(arcname, os.path.relpath(full_path, path)),
+                    )
+        elif os.path.isfile(path):
+            self.add_file(path, arcname)
+
+    def add_file(self, path: str, arcname: str) -> None:
+        """Add a single file to the archive."""
+        self.files.setdefault(arcname, path)
+
+    def manifest(self) -> str:
+        """Return the name, modification time and size of every member."""
+        entries = []
+        for arcname, path in self.files.items():
+            st = os.stat(path)
+            entries.append([arcname, st.st_mtime_ns, st.st_size])
+        return json.dumps(entries)
+
+    def write(self, archive: str) -> None:
+        """Write the archive, with a files.lst of its members."""
+        with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for arcname, path in self.files.items():
+                zf.write(path, arcname)
+            zf.writestr("files.lst", "".join(f"{name}\n" for name in self.files))
+
+
+def build_app(
+    toml_path: Path, config: PyAPPMConfiguration, force: bool = False
+) -> None:
+    """Build the application, force rebuilds it even when nothing changed."""
     print("Building the application...")
     toml = LoadAppToml(toml_path)
-    app_path = toml_path.parent
-    app_name = app_path.name
-    archive = Path(toml_path.parent, "build", f"{app_name}.zip")
-    if archive.exists():
-        archive.unlink()
-    zip_archive_relative = Path("../../build", f"{app_name}.zip")
-    zip_archive = Path("build", f"{app_name}.zip")
-    source_path = Path(app_path, "src", app_name)
-    commands = []
-    commands.append(
-        f'cd {source_path}; find . -type f \( -name "*.py" -o -name "py.typed" \) -exec zip -q {zip_archive_relative} {{}} +'
-    )
+    app_path = os.fspath(toml_path.parent)
+    app_name = os.path.basename(app_path)
+    source_path = os.path.join(app_path, "src", app_name)
     includes = toml.get("includes", {})
     files = includes.get("files", [])
+    directories = includes.get("directories", [])
     project = toml.get("project", {})
     version = project.get("version", "1.0.0")
-    directories = includes.get("directories", [])
-    zip_cmd_source = f"cd {source_path};zip -q -u -r {zip_archive_relative}"
-    zip_cmd_parent = f"cd {app_path};zip -q -u -r {zip_archive}"
-    zip_cmd_local = f"cd {app_path};zip -q -u -r {zip_archive}"
-    zip_cmd_build = f"cd {app_path / 'build'}; zip -q -u -r {app_name}.zip"
-    cmd_list_files = f"cd {app_path};unzip -l -q {zip_archive} | awk 'NR>2 {{print $NF}}' | head -n -2"
-    cmd_move_archive = f"cd {app_path};mv {zip_archive} "
-    cmd_files_list = f'cd {app_path}; rm {Path("build", "files.lst")}'
     for file in files:
         if ".." in file:
             print(f"Invalid file path in includes: {file}")
             sys.exit(1)
-        commands.append(f"{zip_cmd_source} {file}")
     for directory in directories:
         if ".." in directory:
             print(f"Invalid directory path in includes: {directory}")
             sys.exit(1)
-        commands.append(f"{zip_cmd_parent} {directory}/*")
-    commands.append(f"{zip_cmd_local} deps/*")
-    commands.append(f"{zip_cmd_parent} pyapp.toml")
-    commands.append(f"{zip_cmd_parent} LICENSE.txt")
-    commands.append(f"{zip_cmd_parent} README.md")
-    commands.append(f"{cmd_list_files} > build/files.lst")
-    commands.append(f"{zip_cmd_build} files.lst")
-    commands.append(f"{cmd_move_archive} dist/{app_name}-{version}{PYAPP_EXT}")
-    commands.append(cmd_files_list)
-    for command in commands:
-        run_command(command)
-    print(f"Built {app_name}-{version}{PYAPP_EXT}")
+
+    contents = ArchiveContents()
+    for root, _, filenames in os.walk(source_path):
+        for filename in filenames:
+            if filename.endswith(SOURCE_SUFFIXES) or filename in SOURCE_FILES:
+                full_path = os.path.join(root, filename)
+                contents.add_file(full_path, os.path.relpath(full_path, source_path))
+    for file in files:
+        contents.add(os.path.join(source_path, file), file)
+    for directory in directories:
+        contents.add(os.path.join(app_path, directory), directory)
+    contents.add(os.path.join(app_path, "deps"), "deps")
+    for file in APP_FILES:
+        contents.add(os.path.join(app_path, file), file)
+
+    build_path = os.path.join(app_path, "build")
+    dist_path = os.path.join(app_path, "dist")
+    os.makedirs(build_path, exist_ok=True)
+    os.makedirs(dist_path, exist_ok=True)
+    package = f"{app_name}-{version}{PYAPP_EXT}"
+    package_path = os.path.join(dist_path, package)
+    # Skip the build when no file changed since the last one (by mtime and size) and its
+    # package is still a readable archive, use --force to always rebuild.
+    build_cache = Path(build_path, BUILD_CACHE_FILE)
+    manifest = contents.manifest()
+    if not force and build_cache.is_file() and zipfile.is_zipfile(package_path):
+        if build_cache.read_text() == manifest:
+            print(f"{package} is up to date")
+            print("Done!")
+            return
+    archive = os.path.join(build_path, f"{app_name}.zip")
+    contents.write(archive)
+    shutil.move(archive, package_path)
+    build_cache.write_text(manifest)
+    print(f"Built {package}")
     print("Done!")
@@ -40,9 +40,10 @@
 
 import os
 from pathlib import Path
-from datetime import datetime
+from datetime import date
 import sys
 import shutil
+import functools
 
 from pyappm_configuration import PyAPPMConfiguration  # type: ignore
 
@@ -55,8 +56,46 @@ from dotdict import DotDict  # type: ignore
 
 from pyapp_toml import CreateAppToml  # type: ignore
 
-from pyappm_tools import run_command  # type: ignore
-from pyappm_tools import run_command_output  # type: ignore
+from pyappm_tools import run_argv  # type: ignore
+
+INIT_DIRECTORIES = ("tests", "docs", "dist", "deps", "build")
+
+GITIGNORE_LINES = (
+    "dist/",
+    "build/",
+    "deps/",
+    "env/",
+    "__pycache__/",
+    "*.pyc",
+    "*.pyo",
+    "*.pyd",
+    "*.egg-info",
+    "*.code-workspace",
+    ".vscode/",
+    ".mypy_cache/",
+)
+
+
+# The default <app_name>.py, filled in by write_pyapp_py().
+PYAPP_PY_TEMPLATE = """# -*- coding: utf-8 -*-
+# Path: src/{app_name}/{app_name}.py
+# Authors: {authors}
+# Email: {emails}
+# License: MIT License
+# Date: {date}
+
+# Description:
+#
+# This is the main entry point for the {app_name} application
+#
+
+def {main_function}() -> None:
+    print("Hello from {app_name}!")
+    
+if __name__ == "__main__":
+    {main_function}()
+
+"""
 
 
 def print_install_dependencies() -> None:
@@ -67,7 +106,8 @@ def print_install_dependencies() -> None:
     sys.exit(404)
 
 
-def check_dependencies():
+@functools.cache
+def check_dependencies() -> None:
     # Check if pip3 is installed
     if shutil.which("pip3") is None:
         print_install_dependencies()
@@ -75,43 +115,38 @@ def check_dependencies():
     # we assume people listen and have venv installed.
 
 
-def write_pyapp_py(path: Path, app_name: str, config: PyAPPMConfiguration) -> None:
-    """Write the default <app_name>.py file to the specified path."""
-    with open(path, "w") as file:
-        file.write(
-            f"""# -*- coding: utf-8 -*-
-# Path: src/{app_name}/{app_name}.py
-# Authors: {", ".join([author["name"] for author in config.authors])}
-# Email: {", ".join([author["email"] for author in config.authors])}
-# License: MIT License
-# Date: {datetime.now().strftime("%Y-%m-%d")}
-
-# Description:
-#
-# This is the main entry point for the {app_name} application
-#
+def resolve_app_path(path: str) -> Path:
+    """Resolve the path given to init, "." is the current directory."""
+    if path == ".":
+        return Path(os.getcwd())
+    # expanduser() leaves paths without a leading ~ as they are.
+    return Path(path).expanduser()
 
-def {config.default_main_function}() -> None:
-    print("Hello from {app_name}!")
-    
-if __name__ == "__main__":
-    {config.default_main_function}()
 
-"""
+def write_pyapp_py(path: Path, app_name: str, config: PyAPPMConfiguration) -> None:
+    """Write the default <app_name>.py file to the specified path."""
+    # Collect the names and emails in one pass over the authors.
+    names = []
+    emails = []
+    for author in config.authors:
+        names.append(author["name"])
+        emails.append(author["email"])
+    path.write_text(
+        PYAPP_PY_TEMPLATE.format(
+            app_name=app_name,
+            authors=", ".join(names),
+            emails=", ".join(emails),
+            date=date.today().isoformat(),
+            main_function=config.default_main_function,
         )
+    )
 
 
 def init_pyapp(path: str, is_service: bool, config: PyAPPMConfiguration) -> None:
     """Initialize the application in the specified directory."""
     EnsureVirtualEnvIsNotActive()
     check_dependencies()  # Check if pip3 and venv are installed but only if no virtual environment is active.
-    pth: Path
-    if path == ".":
-        pth = Path(os.getcwd())
-    elif "~" in path:
-        pth = Path(path).expanduser()
-    else:
-        pth = Path(path)
+    pth = resolve_app_path(path)
     app_name = pth.name
     if not pth.exists():
         pth.mkdir(parents=True, exist_ok=True)
@@ -120,54 +155,35 @@ def init_pyapp(path: str, is_service: bool, config: PyAPPMConfiguration) -> None
     Path(pth, "src", app_name).mkdir(parents=True, exist_ok=True)
     if config.create_gitignore is True:
         print("Initializing .gitignore")
-        Path(pth, ".gitignore").touch()
-        cmd_list = [
-            "cd pth && echo 'dist/' > .gitignore",
-            "cd pth && echo 'build/' >> .gitignore",
-            "cd pth && echo 'deps/' >> .gitignore",
-            "cd pth && echo 'env/' >> .gitignore",
-            "cd pth && echo '__pycache__/' >> .gitignore",
-            "cd pth && echo '*.pyc' >> .gitignore",
-            "cd pth && echo '*.pyo' >> .gitignore",
-            "cd pth && echo '*.pyd' >> .gitignore",
-            "cd pth && echo '*.egg-info' >> .gitignore",
-            "cd pth && echo '*.code-workspace' >> .gitignore",
-            "cd pth && echo '.vscode/' >> .gitignore",
-            "cd pth && echo '.mypy_cache/' >> .gitignore",
-        ]
-        for cmd in cmd_list:
-            run_command(cmd)
-
-    if config.create_init is True:
-        print("Initializing __init__.py")
-        Path(pth, "src", app_name, "__init__.py").touch()
-    if config.create_about is True:
-        print("Initializing __about__.py")
-        Path(pth, "src", app_name, "__about__.py").touch()
-        run_command(
-            f"cd {pth} && echo '__version__ = \"{config.default_app_version}\"' > src/{app_name}/__about__.py"
-        )
-    if config.create_typed is True:
-        print("Initializing py.typed")
-        Path(pth, "src", app_name, "py.typed").touch()
-    if config.create_changelog is True:
-        print("Initializing CHANGELOG.md")
-        Path(pth, "CHANGELOG.md").touch()
-        cmd = f"cd {pth} && echo '# {app_name} Changelog' > CHANGELOG.md"
-        run_command(cmd)
-    Path(pth, "tests").mkdir(exist_ok=True)
-    Path(pth, "docs").mkdir(exist_ok=True)
-    Path(pth, "dist").mkdir(exist_ok=True)
-    Path(pth, "deps").mkdir(exist_ok=True)
-    Path(pth, "build").mkdir(exist_ok=True)
-    if config.create_readme:
-        print("Initializing README.md")
-        Path(pth, "README.md").touch()
-        cmd = f"cd {pth} && echo '# {app_name}' > README.md\n\n"
-    if config.create_license:
-        print("Initializing LICENSE.txt")
-        Path(pth, "LICENSE.txt").touch()
-        cmd = f"cd {pth} && echo '{config.license_text}' > LICENSE.txt"
+        Path(pth, ".gitignore").write_text("\n".join(GITIGNORE_LINES) + "\n")
+
+    # (create, path, text), the file is only touched when there is no text to write.
+    src_path = Path(pth, "src", app_name)
+    files = (
+        (config.create_init, Path(src_path, "__init__.py"), None),
+        (
+            config.create_about,
+            Path(src_path, "__about__.py"),
+            f'__version__ = "{config.default_app_version}"\n',
+        ),
+        (config.create_typed, Path(src_path, "py.typed"), None),
+        (
+            config.create_changelog,
+            Path(pth, "CHANGELOG.md"),
+            f"# {app_name} Changelog\n",
+        ),
+        (config.create_readme, Path(pth, "README.md"), None),
+        (config.create_license, Path(pth, "LICENSE.txt"), None),
+    )
+    for create, file_path, text in files:
+        if create:
+            print(f"Initializing {file_path.name}")
+            if text is None:
+                file_path.touch()
+            else:
+                file_path.write_text(text)
+    for directory in INIT_DIRECTORIES:
+        Path(pth, directory).mkdir(exist_ok=True)
     print(f"Initializing {app_name}.py")
     write_pyapp_py(
         Path(pth, "src", app_name, f"{app_name}.py"),
@@ -181,25 +197,17 @@ def init_pyapp(path: str, is_service: bool, config: PyAPPMConfiguration) -> None
         CreateVirtualEnv(abs_path, config)
     if config.run_git_init:
         # Check if git is installed
-        cmd = "git --version"
-        result = run_command(cmd)
+        result = run_argv(["git", "--version"])
         if result != 0:
             print("Git is not installed. Skipping git init.")
         else:
             print("Running git init")
-            cmd = "git init"
-            run_command(cmd)
+            run_argv(["git", "init"], cwd=pth)
     print("Done!")
     print()
 
 
 def check_if_initialized(path: str, config: PyAPPMConfiguration) -> bool:
     """Check if the application has already been initialized."""
-    pth: Path
-    if path == ".":
-        pth = Path(os.getcwd())
-    elif "~" in path:
-        pth = Path(path).expanduser()
-    else:
-        pth = Path(path)
+    pth = resolve_app_path(path)
     return Path(pth, APP_TOML).exists()
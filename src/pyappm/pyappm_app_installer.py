@@ -44,7 +44,10 @@
 # A virtual environment must _not_ be active.
 #
 
+import os
 import sys
+import shutil
+import zipfile
 import urllib.parse
 from pathlib import Path
 
@@ -52,16 +55,15 @@ from pyappm_constants import DL_CACHE  # type: ignore
 from pyappm_constants import PYAPP_EXT
 from pyappm_constants import APP_TOML
 from pyappm_constants import EX_UNSUPPORTED_APP_TYPE
-
-from simple_requests import get  # type: ignore
-from simple_requests import Response  # type: ignore
+from pyappm_constants import APP_DIR
 
 from pyappm_tools import run_command  # type: ignore
 from pyappm_tools import make_dependancy_cmd
-from pyappm_tools import create_apps_list
 
 
 from pyapp_toml import LoadAppToml  # type: ignore
+from pyapp_toml import ParseAppToml
+from dotdict import DotDict  # type: ignore
 
 from virtual_env import CreateVirtualEnv  # type: ignore
 
@@ -69,24 +71,51 @@ from pyappm_configuration import PyAPPMConfiguration  # type: ignore
 
 from pyappm_repository import PyAPPMRepositoryManager  # type: ignore
 
+# The executable in the bin directory of the application environment.
+# It activates the environment and starts the runner.
+APP_EXECUTABLE_TEMPLATE = """#!/bin/bash
+cd {parent}
+source activate
+cd ../..
+./{module}_runner $@
+"""
+
+# The runner calls the main function of the application.
+APP_RUNNER_TEMPLATE = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import re
+from {module} import {func}
+
+if __name__ == '__main__':
+    sys.argv[0] = re.sub(r'(-script\\.pyw|\\.exe)?$', '', sys.argv[0])
+    sys.exit({func}())
+"""
+
 
 def download_app(url: str, name: str, version: str) -> bool:
     """Download an application from the repository."""
+    from simple_requests import download  # type: ignore
+    from simple_requests import Response  # type: ignore
+
     header = {"Accept": "application/zip"}
-    response: Response = get(
+    dlpath = Path(DL_CACHE, f"{name}{PYAPP_EXT}")
+    dlpath.parent.mkdir(parents=True, exist_ok=True)
+    response: Response = download(
         url=f"{url}/apps/{urllib.parse.quote(name)}",
+        output=dlpath,
         headers=header,
         params={"version": version},
     )
     if response.status_code != 200:
+        # Don't leave a partial download behind, it would be taken for a cached copy.
+        dlpath.unlink(missing_ok=True)
         print(f"Failed to download {name} from {url}")
         print(f"Status code:  {response.status_code}")
         print(f"Error detail: {response.detail}")
         sys.exit(1)
-    dlpath = Path(DL_CACHE, f"{name}{PYAPP_EXT}")
-    with open(dlpath, "wb") as file:
-        file.write(response.data)
-    return Path(dlpath).exists() and Path(dlpath).stat().st_size > 0
+    return dlpath.exists() and dlpath.stat().st_size > 0
 
 
 def check_dl_cache(name: str) -> bool:
@@ -119,10 +148,13 @@ def get_from_repo_or_cache(
     print(f"Installing {name} from cache.")
 
 
-def write_executables(name: str, config: PyAPPMConfiguration) -> None:
-    """Write the executable files."""
-    app_path = Path(config.app_dir, name)
-    toml = LoadAppToml(Path(app_path, APP_TOML))
+def write_executables(
+    name: str, config: PyAPPMConfiguration, toml: DotDict | None = None
+) -> None:
+    """Write the executable files, the toml is loaded when it is not given."""
+    app_path = os.path.join(config.app_dir, name)
+    if toml is None:
+        toml = LoadAppToml(os.path.join(app_path, APP_TOML))
 
     executables = toml.get("executable", {})
     if len(executables) == 0:
@@ -137,55 +169,53 @@ def write_executables(name: str, config: PyAPPMConfiguration) -> None:
         sys.exit(1)
 
 
-def write_application_executable(
-    app_path: Path, module: str, func: str, config: PyAPPMConfiguration
-) -> None:
-    path = Path(app_path, "env", "bin", module)
-    with open(path, "w") as file:
-        file.write(
-            f"""#!/bin/bash
-cd {path.parent}
-source activate
-cd ../..
-./{module}_runner $@
-"""
-        )
-        run_command(f"chmod +x {path}")
-        run_command(f"ln -s {path} {Path(config.bin_dir, module)}")
-        path = Path(app_path, f"{module}_runner")
-        with open(path, "w") as file:
-            file.write(
-                f"""#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
+def write_script(path: str, text: str) -> None:
+    """Write a script that is created executable, so it doesn't need a chmod."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    with os.fdopen(fd, "w") as file:
+        file.write(text)
 
-import sys
-import re
-from {module} import {func}
 
-if __name__ == '__main__':
-    sys.argv[0] = re.sub(r'(-script\.pyw|\.exe)?$', '', sys.argv[0])
-    sys.exit({func}())
-"""
-            )
-        run_command(f"chmod +x {path}")
+def write_application_executable(
+    app_path: str, module: str, func: str, config: PyAPPMConfiguration
+) -> None:
+    # Plain string paths, these are only joined and handed to the os functions.
+    bin_path = os.path.join(app_path, "env", "bin")
+    path = os.path.join(bin_path, module)
+    write_script(path, APP_EXECUTABLE_TEMPLATE.format(parent=bin_path, module=module))
+    link = os.path.join(config.bin_dir, module)
+    os.makedirs(config.bin_dir, exist_ok=True)
+    try:
+        os.symlink(path, link)
+    except FileExistsError:
+        print(f"{link} already exists, not replacing it.")
+    path = os.path.join(app_path, f"{module}_runner")
+    write_script(path, APP_RUNNER_TEMPLATE.format(module=module, func=func))
 
 
 def check_if_installed(name: str) -> bool:
     """Check if the application is installed."""
     if PYAPP_EXT in name:
         name = Path(name).resolve().name.replace(PYAPP_EXT, "")
-    return name in create_apps_list()
+    # Every installed application has its own directory, so a single stat answers this.
+    if name in ("", ".", "..") or os.sep in name:
+        return False
+    return os.path.isdir(os.path.join(APP_DIR, name))
 
 
-def get_app_name(path: Path, config: PyAPPMConfiguration) -> str:
+def get_app_name(path: Path) -> str:
     """Get the application name from the local file."""
-    run_command(f"unzip -j {path} {APP_TOML} -d {config.temp_dir}")
-    toml = LoadAppToml(Path(config.temp_dir, APP_TOML))
+    # Parse the toml straight from the archive, without extracting it first.
+    try:
+        with zipfile.ZipFile(path) as zf:
+            toml = ParseAppToml(zf.read(APP_TOML).decode("utf-8"))
+    except (KeyError, zipfile.BadZipFile, UnicodeDecodeError):
+        print(f"{path} is not a valid pyapp package")
+        sys.exit(1)
     name = toml.get("project", {}).get("name", "")
     if name == "":
         print(f"Failed to get the application name from {path}")
         sys.exit(1)
-    run_command(f"rm -f {Path(config.temp_dir, APP_TOML)}")
     return name
 
 
@@ -199,7 +229,7 @@ def install_app(
     local = False
     if PYAPP_EXT in name:
         source_path = Path(name).resolve()
-        name = get_app_name(source_path, config)
+        name = get_app_name(source_path)
         local = True
     if local is False:
         source_path = Path(DL_CACHE, f"{name}{PYAPP_EXT}")
@@ -211,7 +241,8 @@ def install_app(
     install_path = Path(config.app_dir, name)
     print(f"Installing {name}... (this may take a while)")
     # Unzip the application to the install path
-    run_command(f"unzip {source_path} -d {install_path}")
+    with zipfile.ZipFile(source_path) as zf:
+        zf.extractall(install_path)
     # Read the application toml file
     toml_path = Path(install_path, APP_TOML)
     data = LoadAppToml(toml_path)
@@ -224,17 +255,18 @@ def install_app(
         ltool=data.tools.env_lib_installer,
         ctool=data.tools.env_create_tool,
     )
-    # install the dependencies
-    for dep in data.project.dependencies:
-        run_command(make_dependancy_cmd(install_path, config, "install", dep.name))
+    # install the dependencies, with a single installer run
+    deps = [dep.name for dep in data.project.dependencies]
+    if len(deps) > 0:
+        run_command(make_dependancy_cmd(install_path, config, "install", deps))
     # write the executables
-    write_executables(name, config)
+    write_executables(name, config, data)
     print(f"Installed {name}")
 
 
 def uninstall_app(name: str, config: PyAPPMConfiguration) -> None:
     app_path = Path(config.app_dir, name)
     print(f"Uninstalling {name}... (this may take a while)")
-    run_command(f"rm -rf {app_path}")  # remove the application
-    run_command(f"rm -f {Path(config.bin_dir, name)}")  # remove the symlink
+    shutil.rmtree(app_path, ignore_errors=True)  # remove the application
+    Path(config.bin_dir, name).unlink(missing_ok=True)  # remove the symlink
     print(f"Uninstalled {name}")
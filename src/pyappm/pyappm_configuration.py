@@ -122,10 +122,10 @@ class PyAPPMConfiguration:
 
     def load(self) -> PyAPPMConfiguration | None:
         # Load the configuration
-        if not self.config_dir.exists():
+        config_file = self.config_dir / CONFIG_FILE_NAME
+        if not config_file.exists():
             self.default().save()
         # Load the configuration file
-        config_file = self.config_dir / CONFIG_FILE_NAME
         if not config_file.exists():
             raise ValueError("Configuration file not found")
         with TomlReader(config_file) as reader:
@@ -34,11 +34,6 @@
 
 from pathlib import Path
 
-from __about__ import __version__  # type: ignore
-from __about__ import __author__  # type: ignore
-from __about__ import __copyright__  # type: ignore
-from __about__ import __license__  # type: ignore
-
 from installer import BIN_DIR  # type: ignore
 from installer import EXE_NAME  # type: ignore
 from installer import INSTALL_DIR  # type: ignore
@@ -57,6 +52,9 @@ CONFIG_FILE_NAME = "pyappmconfig.toml"
 # Define the .toml filename for applications
 APP_TOML = "pyapp.toml"
 
+# Define the name of the file in the build directory that records the last build
+BUILD_CACHE_FILE = ".buildcache"
+
 SHELL_EXE = "/bin/bash"
 ENV_ENVIRON = "VIRTUAL_ENV"
 
@@ -88,6 +86,8 @@ EX_INVALID_VENV_COMMAND = "Invalid venv command."
 EX_INVALID_TOML_COMMAND = "Invalid toml command."
 EX_INVALID_VERSION_STRING = "Invalid version string:"
 EX_INVALID_SERVICE_OPTION = "Service option is only valid with the init command."
+EX_INVALID_NO_CACHE_OPTION = "No-cache option is only valid with the find all command."
+EX_INVALID_FORCE_OPTION = "Force option is only valid with the build command."
 
 EX_APP_ALREADY_INITIALIZED = "Application already initialized."
 EX_DEACTIVATE_VENV = "Please deactivate the virtual environment and try again."
@@ -32,18 +32,27 @@
 
 # This module provides the functions for handling the pyappm repository.
 
+import json
+import time
+import hashlib
 from pathlib import Path
 
 from simple_requests import Response
 
+from pyappm_constants import DL_CACHE  # type: ignore
+
 from pyappm_tools import compare_parsed_versions  # type: ignore
 from pyappm_tools import parse_version
 
 from pyappm_repository_client import PyappmRepositoryClient  # type: ignore
+from pyappm_repository_client import BASE_URL
 
 REPOSITORY_FILE = "repositories.txt"
 REPOSITORY_PATH = Path(f"~/.config/pyappm/{REPOSITORY_FILE}").expanduser()
 
+# Seconds a cached application list is used without asking the repository if it changed.
+REPOSITORY_CACHE_TTL = 300
+
 pyappm_app_version = dict[str, str]  # {"name": name, "version": version}
 pyappm_repo_app_version = dict[str, pyappm_app_version]  # {"repo": repo, "app": app}
 
@@ -57,28 +66,42 @@ class PyAPPMRepository:
 DEFAULT_REPOSITORIES: list[PyAPPMRepository] = [
     PyAPPMRepository("pyappm_main", "https://pyappm.nl/repo")
 ]
+DEFAULT_REPOSITORY_NAMES = frozenset(repo.name for repo in DEFAULT_REPOSITORIES)
+
+
+def repository_cache_path(url: str) -> Path:
+    """Get the path of the cached application list of a repository."""
+    digest = hashlib.blake2b(url.encode()).hexdigest()[:16]
+    return Path(DL_CACHE, f"repo-{digest}.json")
 
 
 class PyAPPMRepositoryManager:
-    def __init__(self) -> None:
+    def __init__(self, use_cache: bool = True) -> None:
+        # Without the cache the application lists are always downloaded again.
+        self.use_cache: bool = use_cache
         self.repositories: list[PyAPPMRepository] = []
+        # The same repositories keyed by name, for the lookups by name.
+        self.repositories_by_name: dict[str, PyAPPMRepository] = {}
         if REPOSITORY_PATH.exists():
             self.load_repository_file(REPOSITORY_PATH)
         else:
-            self.repositories = DEFAULT_REPOSITORIES
+            for repo in DEFAULT_REPOSITORIES:
+                self.add_repository(repo.name, repo.url, False)
             self.save_repository_file(REPOSITORY_PATH)
 
     def __repo_exists__(self, name: str) -> bool:
-        return any(repo.name for repo in self.repositories if repo.name == name)
+        return name in self.repositories_by_name
 
     def __repo_by_name__(self, name: str) -> PyAPPMRepository:
-        return next(repo for repo in self.repositories if repo.name == name)
+        return self.repositories_by_name[name]
 
     def __get_apps_from_response__(
         self, response: Response
     ) -> list[pyappm_app_version]:
+        return self.__get_apps_from_data__(response.json)
+
+    def __get_apps_from_data__(self, data: list | None) -> list[pyappm_app_version]:
         apps: list[pyappm_app_version] = []
-        data = response.json
         if data is None:
             return apps
         for app in data:
@@ -86,6 +109,51 @@ class PyAPPMRepositoryManager:
             apps.append(app)
         return apps
 
+    def __apps_list__(self, url: str) -> list | None:
+        """Get the application list of a repository, cached while it is valid."""
+        cache_path = repository_cache_path(url)
+        cached: dict | None = None
+        try:
+            cached = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            pass  # No usable cache, download the list.
+        if not (
+            isinstance(cached, dict)
+            and isinstance(cached.get("fetched"), (int, float))
+            and "apps" in cached
+        ):
+            cached = None  # Not a cache file this version wrote, treat it as a miss.
+        if self.use_cache and cached is not None:
+            if time.time() - cached["fetched"] < REPOSITORY_CACHE_TTL:
+                return cached["apps"]
+        headers = {}
+        if self.use_cache and cached is not None:
+            # Ask the repository to only send the list when it changed.
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        with PyappmRepositoryClient(url=url) as client:
+            response: Response = client.apps_list(headers=headers)
+        if response.status_code == 304 and cached is not None:
+            cached["fetched"] = time.time()
+        elif response.status_code == 200 and response.json is not None:
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+            cached = {
+                "fetched": time.time(),
+                "etag": response_headers.get("etag"),
+                "last_modified": response_headers.get("last-modified"),
+                "apps": response.json,
+            }
+        else:
+            return None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(cached))
+        except OSError:
+            pass  # Not being able to write the cache is not an error.
+        return cached["apps"]
+
     def __repo_get_app_list__(self, repo: PyAPPMRepository) -> list[pyappm_app_version]:
         """Load the list of applications from a repository."""
         apps: list[dict[str, str]] = []
@@ -106,7 +174,9 @@ class PyAPPMRepositoryManager:
         if self.__repo_exists__(name):
             print(f"Repository {name}: {url} already exists.")
             return
-        self.repositories.append(PyAPPMRepository(name, url))
+        repo = PyAPPMRepository(name, url)
+        self.repositories.append(repo)
+        self.repositories_by_name[name] = repo
         if verbose:
             print(f"Repository {name}: {url} added.")
 
@@ -115,7 +185,7 @@ class PyAPPMRepositoryManager:
         if not self.__repo_exists__(name):
             print(f"Repository {name} does not exist.")
             return
-        repo: PyAPPMRepository = self.__repo_by_name__(name)
+        repo: PyAPPMRepository = self.repositories_by_name.pop(name)
         self.repositories.remove(repo)
         print(f"Repository {repo.name}: {repo.url} removed.")
 
@@ -154,12 +224,7 @@ class PyAPPMRepositoryManager:
 
     def list_apps(self) -> list:
         """Get the application listfrom the repository."""
-        with PyappmRepositoryClient() as client:
-            apps: Response = client.apps_list()
-        # self.print_response(apps)
-        if apps.status_code != 200:
-            return []
-        return self.__get_apps_from_response__(apps)
+        return self.__get_apps_from_data__(self.__apps_list__(BASE_URL))
 
     def print_response(self, response: Response) -> None:
         """Print the response."""
@@ -195,6 +260,7 @@ class PyAPPMRepositoryManager:
 
     def save_repository_file(self, filename: Path) -> None:
         """Save the repository file."""
+        filename.parent.mkdir(parents=True, exist_ok=True)
         with open(filename, "w") as file:
             file.write("# PyAPPM repositories\n")
             file.write("#\n")
@@ -207,7 +273,7 @@ class PyAPPMRepositoryManager:
             file.write("# End of default repositories\n")
             file.write("#\n")
             for repo in self.repositories:
-                if repo in DEFAULT_REPOSITORIES:
+                if repo.name in DEFAULT_REPOSITORY_NAMES:
                     continue
                 file.write(f"{repo.name} {repo.url}\n")
             file.write("\n")
@@ -52,9 +52,18 @@ class PyappmRepositoryClient:
             headers["Authorization"] = f"Bearer {token}"
         return headers
 
-    def _get(self, path: str, params: dict | None, token: str | None) -> Response:
+    def _get(
+        self,
+        path: str,
+        params: dict | None,
+        token: str | None,
+        headers: dict | None = None,
+    ) -> Response:
+        request_headers = self._get_headers(token)
+        if headers:
+            request_headers.update(headers)
         return self.session.get(
-            f"{self.url}/{path}", params=params, headers=self._get_headers(token)
+            f"{self.url}/{path}", params=params, headers=request_headers
         )
 
     def _post(
@@ -156,8 +165,9 @@ class PyappmRepositoryClient:
 
     # apps methods
 
-    def apps_list(self) -> Response:
-        return self._get("apps/list", token=None, params=None)
+    def apps_list(self, headers: dict | None = None) -> Response:
+        # headers can carry If-None-Match / If-Modified-Since for a conditional request.
+        return self._get("apps/list", token=None, params=None, headers=headers)
 
     def apps_get(self, app_id: str) -> Response:
         return self._get(f"apps/id/{app_id}", token=None, params=None)
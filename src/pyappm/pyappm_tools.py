@@ -32,8 +32,11 @@
 # This module contains utility functions for pyappm.
 
 import os
+import shlex
+import functools
 import subprocess
 from pathlib import Path
+from typing import Iterator
 
 from pyappm_configuration import PyAPPMConfiguration  # type: ignore
 
@@ -50,8 +53,11 @@ from dotdict import DotDict  # type: ignore
 from virtual_env import IsVirtualEnvActive  # type: ignore
 
 
+@functools.lru_cache(maxsize=1)
 def FindAppToml() -> Path | None:
-    """Find the pyapp.toml file in the current directory or its parent directories."""
+    """Find the pyapp.toml file in the current directory or its parent directories.
+    The result is cached for the process, FindAppToml.cache_clear() after a chdir.
+    """
 
     # But first check if we have a virtual environment, because that makes things a lot easier.
     # Also it means that we can use pyappm from anywhere in the filesystem, whereas without the venv, we need to be in the project directory.
@@ -62,10 +68,13 @@ def FindAppToml() -> Path | None:
         return None  # We are in a virtual environment, but there is no pyapp.toml file in the parent directory.
     # At this point, we must be in the project directory.
     current_dir = Path(os.getcwd())
-    while current_dir != Path.home() and current_dir != Path("/"):
-        if Path(current_dir, APP_TOML).exists():
-            return Path(current_dir, APP_TOML)
-        current_dir = Path(current_dir).parent
+    home_dir = Path.home()
+    root_dir = Path("/")
+    while current_dir != home_dir and current_dir != root_dir:
+        toml_path = Path(current_dir, APP_TOML)
+        if toml_path.exists():
+            return toml_path
+        current_dir = current_dir.parent
     return None
 
 
@@ -74,6 +83,14 @@ def run_command(command: str) -> int:
     return subprocess.call(command, shell=True, executable=SHELL_EXE)
 
 
+def run_argv(argv: list[str], cwd: Path | str | None = None) -> int:
+    """Run a program without a shell, returns 127 if it can't be started."""
+    try:
+        return subprocess.call(argv, cwd=cwd)
+    except OSError:
+        return 127
+
+
 def run_command_output(command: str) -> str:
     """Run a command in a subprocess and return the output."""
     return subprocess.check_output(command, shell=True, executable=SHELL_EXE).decode(
@@ -82,13 +99,19 @@ def run_command_output(command: str) -> str:
 
 
 def make_dependancy_cmd(
-    path: Path, config: PyAPPMConfiguration, cmd: str, dep: str
+    path: Path, config: PyAPPMConfiguration, cmd: str, dep: str | list[str]
 ) -> str:
-    """Make the installer command."""
-    env_path = Path(path, config.default_env_name, "bin").resolve()
+    """Make the installer command, for one dependency or a list of them."""
+    if isinstance(dep, str):
+        dep = [dep]
+    # Quote every package, so extras and version specifiers like name[extra] or pkg>=1.0
+    # aren't glob-expanded or taken as a redirect by the shell.
+    packages = " ".join(shlex.quote(pkg) for pkg in dep)
+    env_path = os.path.realpath(os.path.join(path, config.default_env_name, "bin"))
     lib_installer = config.env_lib_installer_tool
     return (
-        f"cd {env_path}; source activate; {lib_installer} {cmd} {dep} > /dev/null 2>&1"
+        f"cd {env_path}; source activate; "
+        f"{lib_installer} {cmd} {packages} > /dev/null 2>&1"
     )
 
 
@@ -105,18 +128,19 @@ def get_list_diff(
     return [pkg for pkg in new_packages if pkg not in old_packages and pkg != dep]
 
 
-def create_apps_list() -> list[str]:
-    """Get the installed applications from the application directory."""
-    apps: list[str] = []
-    path_to_check = Path(os.path.expanduser(APP_DIR))
-    if not path_to_check.exists():
+def iter_apps(app_dir: Path = APP_DIR) -> Iterator[str]:
+    """Yield the installed applications from the application directory."""
+    try:
+        entries = os.scandir(app_dir)
+    except FileNotFoundError:
         # create the path if it doesn't exist, you should never get here, but just in case.
-        path_to_check.mkdir(parents=True, exist_ok=True)
-        return apps
-    for app in path_to_check.iterdir():
-        if app.is_dir():
-            apps.append(app.name)
-    return apps
+        app_dir.mkdir(parents=True, exist_ok=True)
+        return
+    with entries:
+        for entry in entries:
+            # The entry type comes from readdir, so this doesn't stat every entry.
+            if entry.is_dir(follow_symlinks=False):
+                yield entry.name
 
 
 def load_app_toml(name: str) -> DotDict:
@@ -35,14 +35,20 @@
 # It provides a simple API to make HTTP requests using GET and POST methods.
 # The Response class is used to store the response data, including the status code and response text.
 # The get() and post() functions are used to make GET and POST requests, respectively.
+# The download() function streams the response body of a GET request to a file.
 #
 
+import os
+import shutil
 from typing import Any
 import urllib.parse
 import urllib.request
 from urllib.error import HTTPError, URLError
 import json
 
+# Size of the chunks in which a download is copied to disk.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class Response:
     def __init__(
@@ -54,6 +60,7 @@ class Response:
         timeout: float = 10.0,
         verify: bool = True,
         params: dict | None = None,
+        output: str | os.PathLike | None = None,
     ):
         self.url: str = url
         self.data: Any = data
@@ -67,6 +74,7 @@ class Response:
         self.params: dict | None = params
         self.raw: bytes | None = None
         self.detail: str = ""
+        self.output: str | os.PathLike | None = output
         self._make_request()
 
     def _make_request(self):
@@ -88,8 +96,14 @@ class Response:
         try:
             with urllib.request.urlopen(req, timeout=self.timeout) as response:
                 self.status_code = response.status
-                self.raw = response.read()
                 self.headers = dict(response.headers)
+                if self.output is not None:
+                    # Stream the body to the output file, without keeping it in memory.
+                    with open(self.output, "wb") as file:
+                        shutil.copyfileobj(response, file, DOWNLOAD_CHUNK_SIZE)
+                    self.data = None
+                    return
+                self.raw = response.read()
                 content_type = response.headers.get("Content-Type")
                 if content_type:
                     if "application/json" in content_type:
@@ -132,6 +146,24 @@ def get(
     return Response(url, headers=headers, params=params, verify=verify, timeout=timeout)
 
 
+def download(
+    url,
+    output: str | os.PathLike,
+    headers=None,
+    params=None,
+    verify: bool = True,
+    timeout: float = 10.0,
+) -> Response:
+    return Response(
+        url,
+        headers=headers,
+        params=params,
+        verify=verify,
+        timeout=timeout,
+        output=output,
+    )
+
+
 def post(
     url,
     data=None,
@@ -48,6 +48,9 @@
 #     data.tool1.option = "value"
 #     data.tool2.option = "value"
 #     writer.write(data)
+#
+# loads Usage example:
+# data = loads(text)
 
 from __future__ import annotations
 from typing import Any
@@ -64,12 +67,8 @@ class TomlReader:
         self.file_path = file_path
 
     def read(self) -> DotDict:
-        data = DotDict()  # Reset the data
-        with TomlTokenizer(self.file_path) as tokenizer:
-            tokens = tokenizer.tokenize()
-            with TomlParser() as parser:
-                data = parser.parse(tokens)
-        return data
+        # Read the whole file in one call and parse it from memory.
+        return loads(Path(self.file_path).read_bytes().decode("utf-8"))
 
     def __enter__(self) -> TomlReader:
         return self  # Return the DotDict for direct access
@@ -79,6 +78,14 @@ class TomlReader:
         pass
 
 
+def loads(text: str) -> DotDict:
+    """Parse toml text that was already read, for example from an archive."""
+    with TomlTokenizer() as tokenizer:
+        tokens = tokenizer.tokenize_text(text)
+        with TomlParser() as parser:
+            return parser.parse(tokens)
+
+
 class TomlWriter:
     def __init__(self, file_path: Path) -> None:
         self.file_path: Path = file_path
@@ -54,10 +54,11 @@ class TomlToken:
 
 
 class TomlTokenizer:
-    def __init__(self, path: Path) -> None:
-        if not isinstance(path, Path):
+    def __init__(self, path: Path | None = None) -> None:
+        # Without a path only tokenize_text() can be used.
+        if path is not None and not isinstance(path, Path):
             raise TypeError("Path must be a pathlib.Path object")
-        self.path: Path = path
+        self.path: Path | None = path
         self.tokens: list[TomlToken] = []
 
     def read_tokens(self, line: str) -> None:
@@ -88,13 +89,16 @@ class TomlTokenizer:
                 self.tokens.append(TomlToken("CHAR", char))
 
     def tokenize(self) -> list[TomlToken]:
-        with self.path.open("r") as file:
-            for line in file:
-                if not line:
-                    continue
-                if line.startswith("#"):
-                    continue
-                self.read_tokens(line)
+        # Read the whole file at once instead of streaming it line by line.
+        return self.tokenize_text(self.path.read_text())
+
+    def tokenize_text(self, text: str) -> list[TomlToken]:
+        for line in text.splitlines(keepends=True):
+            if not line:
+                continue
+            if line.startswith("#"):
+                continue
+            self.read_tokens(line)
         self.tokens.append(TomlToken("EOF", ""))
         return self.tokens
 
@@ -36,6 +36,7 @@
 
 import os
 import sys
+import shlex
 import subprocess
 
 from pathlib import Path
@@ -165,12 +166,16 @@ def VirtualEnvInstallDependencies(path: Path, config: PyAPPMConfiguration) -> No
         print("No dependencies found.")
         return
     print("Installing dependencies... (this may take a while)")
-    for req in requirements:
-        dep = req[0]
-        if len(req[1]) > 0:
-            dep = f"{dep}[{req[1]}]"
-        cmd = f"cd {envpath}; source activate; {lib_installer} install {dep} > /dev/null 2>&1"
-        subprocess.call(cmd, shell=True, executable=SHELL_EXE)
+    deps = []
+    for name, extra in requirements:
+        dep = name if len(extra) == 0 else f"{name}[{extra}]"
+        deps.append(shlex.quote(dep))
+    # One installer run for all dependencies, so they're resolved together.
+    cmd = (
+        f"cd {envpath}; source activate; "
+        f"{lib_installer} install {' '.join(deps)} > /dev/null 2>&1"
+    )
+    subprocess.call(cmd, shell=True, executable=SHELL_EXE)
     print("Dependencies installed.")
 
 